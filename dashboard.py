@@ -1,15 +1,14 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import os
-import time
 from datetime import datetime
 
 # Import functions from the analysis script
 from one import (
-    preprocess_data, detect_anomalies, risk_scoring, 
+    load_data, preprocess_data, fit_anomaly_model, detect_anomalies, risk_scoring, 
     variance_analysis, generate_commentary, document_intelligence
 )
 
@@ -76,6 +75,206 @@ st.markdown("""
 GREEN_SEQUENTIAL = ['#E7F5E9', '#C3E6CB', '#9FD8B4', '#78C27C', '#5AAD61', '#3C9748', '#2E8B57']
 GREEN_DIVERGENT = ['#198754', '#63C392', '#C3E6CB', '#FFFFFF', '#C3E6CB', '#63C392', '#198754']
 
+# Cached figure builders - Plotly figures are only rebuilt when their inputs
+# change, instead of on every tab switch or widget interaction
+@st.cache_resource(max_entries=32)
+def build_category_bar(category_amounts):
+    categories = [item[0] for item in category_amounts]
+    amounts = [item[1] for item in category_amounts]
+    
+    fig = px.bar(
+        x=amounts, 
+        y=categories,
+        orientation='h',
+        color=amounts,
+        color_continuous_scale=GREEN_SEQUENTIAL,
+        labels={'x': 'Amount ($)', 'y': 'Category'},
+        title=''
+    )
+    fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_monthly_volume_line(monthly_volume):
+    months = [item[0] for item in monthly_volume]
+    amounts = [item[1] for item in monthly_volume]
+    
+    fig = px.line(
+        x=months, 
+        y=amounts,
+        markers=True,
+        line_shape='spline',
+        color_discrete_sequence=['#2E8B57'],
+        labels={'x': 'Month', 'y': 'Amount ($)'},
+        title=''
+    )
+    fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_risk_histogram(risk_scores):
+    fig = px.histogram(
+        x=risk_scores,
+        color_discrete_sequence=['#78C27C'],
+        opacity=0.8,
+        nbins=20
+    )
+    fig.add_vline(x=30, line_dash="dash", line_color="#2E8B57", annotation_text="Low Risk Threshold")
+    fig.add_vline(x=70, line_dash="dash", line_color="#2E8B57", annotation_text="High Risk Threshold")
+    fig.update_layout(height=300, margin=dict(l=10, r=10, b=10, t=10))
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_anomaly_scatter(df):
+    # Precompute per-point colors and sizes so all points are drawn as one
+    # WebGL trace, instead of plotly express splitting df by anomaly status
+    is_anomaly = df['AI_Anomaly_Flag'].to_numpy() == 1
+    colors = np.where(is_anomaly, '#2E8B57', '#78C27C')
+    sizes = np.abs(df['Amount'].to_numpy())  # Absolute amounts for marker sizing
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=df['Amount'],
+        y=df['Risk Score'],
+        mode='markers',
+        showlegend=False,
+        customdata=df[['Transaction ID', 'Category', 'Date']].astype(str).to_numpy(),
+        hovertemplate=(
+            "Amount=%{x}<br>Risk Score=%{y}<br>Transaction ID=%{customdata[0]}<br>"
+            "Category=%{customdata[1]}<br>Date=%{customdata[2]}<extra></extra>"
+        ),
+        marker=dict(
+            color=colors,
+            size=sizes,
+            sizemode='area',
+            sizeref=2.0 * max(sizes.max(initial=0), 1) / (20 ** 2),  # Same scaling as px.scatter's size_max=20
+            opacity=0.7,
+            line=dict(width=1, color='#FFFFFF')  # Add white border to make points more distinct
+        )
+    ))
+    
+    # Legend entries come from two empty traces, one per anomaly status
+    for name, color in [('Normal', '#78C27C'), ('Anomaly', '#2E8B57')]:
+        fig.add_trace(go.Scattergl(
+            x=[None],
+            y=[None],
+            mode='markers',
+            name=name,
+            marker=dict(color=color, size=10)
+        ))
+    
+    # Add custom legend to clarify anomaly status
+    fig.update_layout(
+        height=500, 
+        margin=dict(l=10, r=10, b=10, t=10),
+        xaxis_title="Amount",
+        yaxis_title="Risk Score",
+        legend=dict(
+            title="Anomaly Status",
+            itemsizing="constant",
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_anomaly_pie(df):
+    # value_counts is a single hashed pass that already returns counts sorted descending
+    category_anomalies = df.loc[df['AI_Anomaly_Flag'].to_numpy().astype(bool), 'Category'].value_counts()
+    
+    # Category is categorical, so drop the zero counts for categories with no anomalies
+    category_anomalies = category_anomalies[category_anomalies > 0]
+    
+    fig = px.pie(
+        values=category_anomalies.values,
+        names=category_anomalies.index.astype(str),  # Plain labels, not a CategoricalIndex
+        color_discrete_sequence=GREEN_SEQUENTIAL,
+        hole=0.4
+    )
+    fig.update_layout(height=500, margin=dict(l=10, r=10, b=10, t=10))
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_variance_heatmap(variances):
+    # Convert the Period index to string for Plotly
+    variance_df = variances.tail(3).reset_index()
+    variance_df['Date'] = variance_df['Date'].astype(str)
+    
+    # Create a heatmap of the variances
+    categories = variance_df.columns[1:]
+    dates = variance_df['Date'].tolist()
+    
+    # One category per row: transpose the (month x category) block in one step
+    z_values = variance_df[categories].to_numpy().T
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=z_values,
+        x=dates,
+        y=list(categories),
+        colorscale=GREEN_SEQUENTIAL,
+        colorbar=dict(title='Variance %'),
+    ))
+    
+    fig.update_layout(
+        height=500,
+        margin=dict(l=10, r=10, b=10, t=10),
+        xaxis_title="Month",
+        yaxis_title="Category"
+    )
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_category_trends(monthly_data, selected_categories):
+    # Convert monthly data to a format suitable for plotting
+    monthly_df = monthly_data.reset_index()
+    monthly_df['Date'] = monthly_df['Date'].astype(str)
+    
+    fig = go.Figure()
+    
+    # Use different shades of green for each category
+    green_colors = GREEN_SEQUENTIAL
+    
+    for i, category in enumerate(selected_categories):  # Fixed: added enumerate() function
+        color_idx = i % len(green_colors)
+        fig.add_trace(go.Scatter(
+            x=monthly_df['Date'],
+            y=monthly_df[category],
+            mode='lines+markers',
+            name=category,
+            line=dict(color=green_colors[color_idx], width=3),
+            marker=dict(color=green_colors[color_idx], size=8)
+        ))
+    
+    fig.update_layout(
+        height=400,
+        margin=dict(l=10, r=10, b=10, t=10),
+        xaxis_title="Month",
+        yaxis_title="Amount ($)"
+    )
+    return fig
+
+@st.cache_resource(max_entries=32)
+def build_term_bar(word_counts):
+    # Create word cloud visualization
+    words = [item[0] for item in word_counts]
+    counts = [item[1] for item in word_counts]
+    
+    fig = px.bar(
+        x=counts,
+        y=words,
+        orientation='h',
+        color=counts,
+        color_continuous_scale=GREEN_SEQUENTIAL,
+        labels={'x': 'Frequency', 'y': 'Term'},
+        title="Common Terms in Transaction Notes"
+    )
+    fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
+    return fig
+
 # Application header with logo
 col1, col2 = st.columns([1, 5])
 
@@ -102,35 +301,84 @@ with st.sidebar:
     st.info("This dashboard provides real-time financial analysis for Maple Leaf Restaurant operations.")
 
 # Load and process data - hardcode the filename
-@st.cache_data
-def load_data():
-    df = pd.read_csv('maple_leaf_restaurant_financial_data.csv')
-    df = preprocess_data(df)
-    return df
-
-# Loading spinner
-with st.spinner("Loading and analyzing data..."):
-    df = load_data()
-    
-    # Run analyses with fixed anomaly threshold
-    anomaly_threshold = 0.05  # Fixed value
-    df, anomalies = detect_anomalies(df, contamination=anomaly_threshold)
+DATA_PATH = 'maple_leaf_restaurant_financial_data.csv'
+
+# Keep the fitted Isolation Forest as a shared resource, keyed on the scaled
+# features and contamination, so it is only retrained when the data changes
+@st.cache_resource(max_entries=4, hash_funcs={np.ndarray: lambda a: a.tobytes()})
+def get_iforest(features_scaled, contamination):
+    return fit_anomaly_model(features_scaled, contamination)
+
+# Plain-text financial summary for the Reports tab. This is the cacheable body;
+# the title and report date are added when the tab renders
+def build_financial_summary(stats, commentary):
+    lines = [
+        f"Analysis Period: {stats['date_min'].strftime('%Y-%m-%d')} to {stats['date_max'].strftime('%Y-%m-%d')}",
+        "",
+        "== Key Metrics ==",
+        f"Total Transactions: {stats['n']}",
+        f"Total Transaction Value: ${stats['total']:.2f}",
+        f"Average Transaction Amount: ${stats['mean']:.2f}",
+        f"Anomalies Detected: {stats['n_anom']} ({stats['n_anom']/stats['n']*100:.1f}%)",
+        "",
+        "== AI Commentary =="
+    ]
+    lines.extend(f"• {insight}" for insight in commentary)
+    
+    return "\n".join(lines) + "\n"
+
+# Run the full analysis pipeline once and cache the results, so widget
+# interactions don't refit the model or regroup the data on every rerun
+@st.cache_data(show_spinner="Loading and analyzing data...")
+def run_pipeline(path, contamination):
+    df = preprocess_data(load_data(path))
+    df, anomalies = detect_anomalies(df, contamination=contamination, fit_model=get_iforest)
     df = risk_scoring(df)
     monthly_data, variances = variance_analysis(df)
     commentary = generate_commentary(df, monthly_data, variances)
-    df = document_intelligence(df)
+    df, word_counts = document_intelligence(df, top_n=10)
+    
+    # Summary statistics shared by the KPI row and the reports, computed once
+    stats = dict(
+        n=len(df),
+        total=float(df['Amount'].sum()),
+        mean=float(df['Amount'].mean()),
+        date_min=df['Date'].min(),
+        date_max=df['Date'].max(),
+        n_anom=int((df['AI_Anomaly_Flag'] == 1).sum()),
+        n_high=int((df['Risk Level'] == 'High').sum())
+    )
+    
+    # Anomalies table, taken from the main dataframe after all processing is
+    # done so it includes Risk Level
+    anomaly_view = df.loc[
+        df['AI_Anomaly_Flag'] == 1,
+        ['Transaction ID', 'Date', 'Amount', 'Category', 'Vendor', 'Risk Score', 'Risk Level']
+    ]
+    
+    # Report contents are built here so the Reports tab only serves them
+    reports = dict(
+        financial_summary=build_financial_summary(stats, commentary),
+        # Period is an internal grouping key, not part of the exported schema
+        anomaly_csv=(
+            anomalies.drop(columns=['Period']).to_csv(index=False).encode('utf-8')
+            if len(anomalies) > 0 else None
+        )
+    )
+    return df, anomalies, monthly_data, variances, commentary, word_counts, stats, reports, anomaly_view
 
-# Dashboard main content
-tabs = st.tabs([
-    "📊 Overview", 
-    "💡 Anomaly Detection", 
-    "📈 Variance Analysis", 
-    "🧠 AI Insights",
-    "📑 Reports"
-])
+# Run analyses with fixed anomaly threshold
+anomaly_threshold = 0.05  # Fixed value
+(
+    df, anomalies, monthly_data, variances, commentary, word_counts, stats, reports, anomaly_view
+) = run_pipeline(DATA_PATH, anomaly_threshold)
+
+# Tab bodies - each tab is a fragment, so interacting with a widget inside a
+# tab only reruns that tab instead of the whole app
 
 # 1. Overview Tab
-with tabs[0]:
+@st.fragment
+def overview_tab(df, stats, monthly_data):
     st.header("Financial Overview")
     
     # KPI metrics row
@@ -140,7 +388,7 @@ with tabs[0]:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             "Total Transactions", 
-            f"{len(df):,}",
+            f"{stats['n']:,}",
             delta=None
         )
         st.markdown('</div>', unsafe_allow_html=True)
@@ -149,27 +397,27 @@ with tabs[0]:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric(
             "Total Amount", 
-            f"${df['Amount'].sum():,.2f}",
-            delta=f"{df['Amount'].sum() / len(df):.1f} avg"
+            f"${stats['total']:,.2f}",
+            delta=f"{stats['mean']:.1f} avg"
         )
         st.markdown('</div>', unsafe_allow_html=True)
         
     with col3:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        anomaly_pct = (len(anomalies) / len(df)) * 100
+        anomaly_pct = (stats['n_anom'] / stats['n']) * 100
         st.metric(
             "Anomalies Detected", 
-            f"{len(anomalies)} ({anomaly_pct:.1f}%)",
+            f"{stats['n_anom']} ({anomaly_pct:.1f}%)",
             delta=None
         )
         st.markdown('</div>', unsafe_allow_html=True)
         
     with col4:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        high_risk_count = len(df[df['Risk Level'] == 'High'])
+        high_risk_count = stats['n_high']
         st.metric(
             "High Risk Transactions", 
-            f"{high_risk_count} ({high_risk_count/len(df)*100:.1f}%)",
+            f"{high_risk_count} ({high_risk_count/stats['n']*100:.1f}%)",
             delta=None,
             delta_color="inverse"
         )
@@ -182,52 +430,23 @@ with tabs[0]:
     
     with col1:
         st.subheader("Transactions by Category")
-        category_amounts = df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-        
-        fig = px.bar(
-            x=category_amounts.values, 
-            y=category_amounts.index,
-            orientation='h',
-            color=category_amounts.values,
-            color_continuous_scale=GREEN_SEQUENTIAL,
-            labels={'x': 'Amount ($)', 'y': 'Category'},
-            title=''
-        )
-        fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
-        st.plotly_chart(fig, use_container_width=True)
+        category_amounts = df.groupby('Category', observed=True)['Amount'].sum().sort_values(ascending=False)
+        st.plotly_chart(build_category_bar(tuple(category_amounts.items())), use_container_width=True)
     
     with col2:
         st.subheader("Monthly Transaction Volume")
-        monthly_volume = df.groupby(df['Date'].dt.to_period('M'))['Amount'].sum()
-        
-        fig = px.line(
-            x=monthly_volume.index.astype(str), 
-            y=monthly_volume.values,
-            markers=True,
-            line_shape='spline',
-            color_discrete_sequence=['#2E8B57'],
-            labels={'x': 'Month', 'y': 'Amount ($)'},
-            title=''
-        )
-        fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
-        st.plotly_chart(fig, use_container_width=True)
+        # Derive the monthly totals from the per-category table instead of regrouping
+        monthly_volume = monthly_data.sum(axis=1)
+        monthly_volume = tuple(zip(monthly_volume.index.astype(str), monthly_volume.values))
+        st.plotly_chart(build_monthly_volume_line(monthly_volume), use_container_width=True)
     
     # Risk distribution
     st.subheader("Risk Score Distribution")
-    fig = px.histogram(
-        df, 
-        x='Risk Score',
-        color_discrete_sequence=['#78C27C'],
-        opacity=0.8,
-        nbins=20
-    )
-    fig.add_vline(x=30, line_dash="dash", line_color="#2E8B57", annotation_text="Low Risk Threshold")
-    fig.add_vline(x=70, line_dash="dash", line_color="#2E8B57", annotation_text="High Risk Threshold")
-    fig.update_layout(height=300, margin=dict(l=10, r=10, b=10, t=10))
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(build_risk_histogram(df['Risk Score']), use_container_width=True)
 
 # 2. Anomaly Detection Tab
-with tabs[1]:
+@st.fragment
+def anomaly_tab(df, anomaly_view):
     st.header("Anomaly Detection")
     
     st.markdown("""
@@ -240,87 +459,22 @@ with tabs[1]:
     
     with col1:
         st.subheader("Transaction Amount vs Risk Score")
-        
-        # Create a copy of the dataframe with absolute amounts for marker sizing
-        plot_df = df.copy()
-        plot_df['AbsAmount'] = plot_df['Amount'].abs()
-        
-        fig = px.scatter(
-            plot_df, 
-            x='Amount', 
-            y='Risk Score',
-            color='AI_Anomaly_Flag',
-            color_discrete_map={0: '#78C27C', 1: '#2E8B57'},  
-            hover_data=['Transaction ID', 'Category', 'Date'],
-            size='AbsAmount',
-            opacity=0.7,
-            labels={'AI_Anomaly_Flag': 'Anomaly Status'},
-            title=''
-        )
-        
-        # Update marker properties to enhance visibility
-        fig.update_traces(
-            marker=dict(
-                line=dict(width=1, color='#FFFFFF'),  # Add white border to make points more distinct
-            ),
-            selector=dict(mode='markers')
-        )
-        
-        # Add custom legend to clarify anomaly status
-        fig.update_layout(
-            height=500, 
-            margin=dict(l=10, r=10, b=10, t=10),
-            legend=dict(
-                title="Anomaly Status",
-                itemsizing="constant",
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        
-        # Rename legend items for clarity - with safer implementation
-        newnames = {'0': 'Normal', '1': 'Anomaly'}
-        
-        # Updated trace naming logic to handle possible empty trace names
-        def update_trace_name(trace):
-            if trace.name in newnames:
-                trace.update(name=newnames[trace.name])
-        
-        fig.for_each_trace(update_trace_name)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_anomaly_scatter(df), use_container_width=True)
     
     with col2:
         st.subheader("Anomalies by Category")
-        category_anomalies = df[df['AI_Anomaly_Flag'] == 1].groupby('Category').size().sort_values(ascending=False)
-        
-        fig = px.pie(
-            values=category_anomalies.values,
-            names=category_anomalies.index,
-            color_discrete_sequence=GREEN_SEQUENTIAL,
-            hole=0.4
-        )
-        fig.update_layout(height=500, margin=dict(l=10, r=10, b=10, t=10))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_anomaly_pie(df), use_container_width=True)
     
     # Anomaly data table
     st.subheader("Anomalous Transactions")
-    if len(anomalies) > 0:
-        # Get anomalies from the main dataframe after all processing is done
-        # This ensures we have all columns including Risk Level
-        anomaly_display = df[df['AI_Anomaly_Flag'] == 1]
-        st.dataframe(
-            anomaly_display[['Transaction ID', 'Date', 'Amount', 'Category', 'Vendor', 'Risk Score', 'Risk Level']],
-            use_container_width=True
-        )
+    if len(anomaly_view) > 0:
+        st.dataframe(anomaly_view, use_container_width=True, hide_index=True)
     else:
         st.info("No anomalies detected with current settings.")
 
 # 3. Variance Analysis Tab
-with tabs[2]:
+@st.fragment
+def variance_tab(monthly_data, variances):
     st.header("Variance Analysis")
     
     st.markdown("""
@@ -331,42 +485,11 @@ with tabs[2]:
     # Variance visualization
     st.subheader("Month-over-Month Category Variance (%)")
     
-    # Convert the Period index to string for Plotly
-    variance_df = variances.tail(3).reset_index()
-    variance_df['Date'] = variance_df['Date'].astype(str)
-    
-    # Create a heatmap of the variances
-    categories = variance_df.columns[1:]
-    dates = variance_df['Date'].tolist()
-    
-    z_values = []
-    for cat in categories:
-        z_values.append(variance_df[cat].tolist())
-    
-    fig = go.Figure(data=go.Heatmap(
-        z=z_values,
-        x=dates,
-        y=categories,
-        colorscale=GREEN_SEQUENTIAL,
-        colorbar=dict(title='Variance %'),
-    ))
-    
-    fig.update_layout(
-        height=500,
-        margin=dict(l=10, r=10, b=10, t=10),
-        xaxis_title="Month",
-        yaxis_title="Category"
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(build_variance_heatmap(variances), use_container_width=True)
     
     # Category trends
     st.subheader("Category Trends Over Time")
     
-    # Convert monthly data to a format suitable for plotting
-    monthly_df = monthly_data.reset_index()
-    monthly_df['Date'] = monthly_df['Date'].astype(str)
-    
     # Create dropdown for category selection
     selected_categories = st.multiselect(
         "Select Categories to Display",
@@ -375,35 +498,13 @@ with tabs[2]:
     )
     
     if selected_categories:
-        fig = go.Figure()
-        
-        # Use different shades of green for each category
-        green_colors = GREEN_SEQUENTIAL
-        
-        for i, category in enumerate(selected_categories):  # Fixed: added enumerate() function
-            color_idx = i % len(green_colors)
-            fig.add_trace(go.Scatter(
-                x=monthly_df['Date'],
-                y=monthly_df[category],
-                mode='lines+markers',
-                name=category,
-                line=dict(color=green_colors[color_idx], width=3),
-                marker=dict(color=green_colors[color_idx], size=8)
-            ))
-        
-        fig.update_layout(
-            height=400,
-            margin=dict(l=10, r=10, b=10, t=10),
-            xaxis_title="Month",
-            yaxis_title="Amount ($)"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(build_category_trends(monthly_data, tuple(selected_categories)), use_container_width=True)
     else:
         st.info("Please select at least one category to display.")
 
 # 4. AI Insights Tab
-with tabs[3]:
+@st.fragment
+def insights_tab(commentary, word_counts):
     st.header("AI-Generated Insights")
     
     st.markdown("""
@@ -423,36 +524,15 @@ with tabs[3]:
     # Document intelligence insights
     st.subheader("Document Intelligence")
     
-    notes_count = df['Notes'].notna().sum()
-    if notes_count > 0:
-        common_words = []
-        for note in df['Notes'].dropna():
-            words = note.lower().split()
-            common_words.extend([w for w in words if len(w) > 3])
-        
-        from collections import Counter
-        word_counts = Counter(common_words).most_common(10)
-        
-        # Create word cloud visualization
-        words = [item[0] for item in word_counts]
-        counts = [item[1] for item in word_counts]
-        
-        fig = px.bar(
-            x=counts,
-            y=words,
-            orientation='h',
-            color=counts,
-            color_continuous_scale=GREEN_SEQUENTIAL,
-            labels={'x': 'Frequency', 'y': 'Term'},
-            title="Common Terms in Transaction Notes"
-        )
-        fig.update_layout(height=400, margin=dict(l=10, r=10, b=10, t=10))
-        st.plotly_chart(fig, use_container_width=True)
+    # Term counts come precomputed from document_intelligence in the pipeline
+    if word_counts:
+        st.plotly_chart(build_term_bar(tuple(word_counts)), use_container_width=True)
     else:
         st.info("No transaction notes available for analysis.")
 
 # 5. Reports Tab
-with tabs[4]:
+@st.fragment
+def reports_tab(reports):
     # Add logo in reports section
     col1, col2, col3 = st.columns([1, 3, 1])
     with col2:
@@ -473,50 +553,28 @@ with tabs[4]:
     with col1:
         st.subheader("Standard Reports")
         
-        if st.button("Generate Financial Summary", key="fin_summary"):
-            with st.spinner("Generating financial summary..."):
-                time.sleep(1)  # Simulate report generation
-                
-                report_content = f"""
-                === Maple Leaf Restaurant Financial Analysis ===
-
-                Report Date: {datetime.now().strftime('%Y-%m-%d')}
-                Analysis Period: {df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}
-
-                == Key Metrics ==
-                Total Transactions: {len(df)}
-                Total Transaction Value: ${df['Amount'].sum():.2f}
-                Average Transaction Amount: ${df['Amount'].mean():.2f}
-                Anomalies Detected: {len(anomalies)} ({len(anomalies)/len(df)*100:.1f}%)
-
-                == AI Commentary ==
-                """
-                
-                for insight in commentary:
-                    report_content += f"• {insight}\n"
-                
-                st.download_button(
-                    "Download Financial Summary",
-                    report_content,
-                    file_name="financial_summary.txt",
-                    mime="text/plain"
-                )
+        # Report contents are prebuilt by the cached pipeline; only the
+        # report date is stamped here so it is current on every download
+        report_header = (
+            "=== Maple Leaf Restaurant Financial Analysis ===\n\n"
+            f"Report Date: {datetime.now().strftime('%Y-%m-%d')}\n"
+        )
+        st.download_button(
+            "Download Financial Summary",
+            report_header + reports['financial_summary'],
+            file_name="financial_summary.txt",
+            mime="text/plain"
+        )
         
-        if st.button("Generate Anomaly Report", key="anomaly_report"):
-            with st.spinner("Generating anomaly report..."):
-                time.sleep(1)  # Simulate report generation
-                
-                if len(anomalies) > 0:
-                    csv = anomalies.to_csv(index=False)
-                    
-                    st.download_button(
-                        "Download Anomaly Report",
-                        csv,
-                        file_name="anomaly_transactions.csv",
-                        mime="text/csv"
-                    )
-                else:
-                    st.warning("No anomalies detected to include in report.")
+        if reports['anomaly_csv'] is not None:
+            st.download_button(
+                "Download Anomaly Report",
+                reports['anomaly_csv'],
+                file_name="anomaly_transactions.csv",
+                mime="text/csv"
+            )
+        else:
+            st.warning("No anomalies detected to include in report.")
     
     with col2:
         st.subheader("Custom Reports")
@@ -530,16 +588,37 @@ with tabs[4]:
         include_raw_data = st.checkbox("Include raw data", value=False)
         
         if st.button("Generate Custom Report", key="custom_report"):
-            with st.spinner("Generating custom report..."):
-                time.sleep(1.5)  # Simulate report generation
-                
-                st.success(f"{report_type} report generated successfully!")
-                st.download_button(
-                    "Download Custom Report",
-                    f"This is a placeholder for the {report_type} report content.",
-                    file_name=f"{report_type.lower().replace(' ', '_')}_report.txt",
-                    mime="text/plain"
-                )
+            st.success(f"{report_type} report generated successfully!")
+            st.download_button(
+                "Download Custom Report",
+                f"This is a placeholder for the {report_type} report content.",
+                file_name=f"{report_type.lower().replace(' ', '_')}_report.txt",
+                mime="text/plain"
+            )
+
+# Dashboard main content
+tabs = st.tabs([
+    "📊 Overview", 
+    "💡 Anomaly Detection", 
+    "📈 Variance Analysis", 
+    "🧠 AI Insights",
+    "📑 Reports"
+])
+
+with tabs[0]:
+    overview_tab(df, stats, monthly_data)
+
+with tabs[1]:
+    anomaly_tab(df, anomaly_view)
+
+with tabs[2]:
+    variance_tab(monthly_data, variances)
+
+with tabs[3]:
+    insights_tab(commentary, word_counts)
+
+with tabs[4]:
+    reports_tab(reports)
 
 # Footer with logo
 st.markdown("---")